@@ -0,0 +1,95 @@
+"""
+Wall-clock time of the async feed fetcher against a local stub HTTP server
+
+Serves N small feeds, each with a fixed artificial latency, and ingests all of them
+at several concurrency limits. Time should track N / concurrency * latency, not
+N * latency, until the per-feed CPU cost of parsing and writing (which also
+competes with the stub server for cores) becomes the floor.
+
+    python benchmarks/bench_async_ingest.py --feeds 1000 --latency 0.05
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from prompthound.vendor.feed_to_sqlite.aio import ingest_feeds
+
+
+def make_rss(n, entries=10):
+    items = "".join(
+        f"<item><title>Post {n}-{i}</title><link>http://example.com/{n}/{i}</link>"
+        f"<guid>http://example.com/{n}/{i}</guid>"
+        f"<description>Entry {i} of feed {n}</description>"
+        f"<pubDate>Mon, 01 Jan 2024 00:00:{i:02d} GMT</pubDate></item>"
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel>'
+        f"<title>Feed {n}</title><link>http://example.com/{n}</link>{items}"
+        "</channel></rss>"
+    ).encode()
+
+
+def serve(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = make_rss(int(self.path.strip("/")))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feeds", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 25, 50, 100])
+    args = parser.parse_args()
+
+    server = serve(args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/{n}" for n in range(args.feeds)]
+
+    print(f"{args.feeds} feeds, {args.latency * 1000:.0f} ms latency each")
+    print(f"{'concurrency':>12} {'seconds':>9} {'ideal':>9} {'feeds/s':>9}")
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            results = ingest_feeds(
+                Path(tmp) / "bench.db",
+                urls,
+                table_name="entries",
+                concurrency=concurrency,
+                per_host=concurrency,
+            )
+            elapsed = time.perf_counter() - start
+
+        assert all(r.status == "ok" for r in results), "some fetches failed"
+        ideal = args.feeds / concurrency * args.latency
+        print(
+            f"{concurrency:>12} {elapsed:>9.2f} {ideal:>9.2f} "
+            f"{args.feeds / elapsed:>9.0f}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
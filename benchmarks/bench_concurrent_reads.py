@@ -0,0 +1,156 @@
+"""
+Read latency while a bulk ingest is writing, with and without the database profile
+
+A writer process upserts batches of entries (500 rows per transaction, as
+`upsert_entries` does for a big feed) into a table already holding SEED_FEEDS feeds'
+worth of entries, while a reader process repeatedly asks for the latest 20 entries of
+a random feed, as `stats`, Datasette or an ad-hoc query would.
+
+- default: rollback journal, synchronous=FULL, no entry indexes (as before)
+- indexed: the default settings with the `(feed, published)` / `updated` indexes
+- tuned: the indexes and `database.PRAGMAS` (WAL, synchronous=NORMAL, bigger
+  cache, mmap, busy_timeout)
+
+    python benchmarks/bench_concurrent_reads.py
+"""
+
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import sqlite_utils
+
+from prompthound.database import apply_pragmas
+from prompthound.vendor.feed_to_sqlite.ingest import (
+    get_entries_table,
+    get_feeds_table,
+    upsert_entries,
+)
+
+SEED_FEEDS = 100
+ENTRIES_PER_FEED = 1000
+BATCHES = 200
+BATCH_SIZE = 500
+
+QUERY = "select * from entries where feed = ? order by published desc limit 20"
+
+
+def feed_url(n):
+    return f"https://example.com/{n}/feed.xml"
+
+
+def entries(feed, start, count):
+    return [
+        {
+            "id": f"{feed_url(feed)}#{i}",
+            "feed": feed_url(feed),
+            "title": f"Entry {i} of feed {feed}",
+            "description": "lorem ipsum dolor sit amet " * 20,
+            "published": f"2024-01-01T00:00:{i % 60:02d}+00:00",
+            "updated": f"2024-01-01T00:00:{i % 60:02d}+00:00",
+            "link": f"https://example.com/{feed}/{i}",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def setup(path, tuned, indexed):
+    db = sqlite_utils.Database(path)
+    if tuned:
+        apply_pragmas(db)
+    get_feeds_table(db).insert_all(
+        {"id": feed_url(n), "title": f"Feed {n}"} for n in range(SEED_FEEDS)
+    )
+    table = get_entries_table(db, "entries", None)
+    if not indexed:
+        for index in table.indexes:
+            if index.origin == "c":  # not the primary key's
+                db.execute(f"drop index [{index.name}]")
+    for n in range(SEED_FEEDS):
+        upsert_entries(table, entries(n, 0, ENTRIES_PER_FEED))
+    db.close()
+
+
+def write(path, tuned, ready):
+    db = sqlite_utils.Database(path)
+    if tuned:
+        apply_pragmas(db)
+    table = get_entries_table(db, "entries", None)
+    ready.wait()
+    start = time.perf_counter()
+    for batch in range(BATCHES):
+        feed = batch % SEED_FEEDS
+        offset = ENTRIES_PER_FEED + (batch // SEED_FEEDS) * BATCH_SIZE
+        upsert_entries(table, entries(feed, offset, BATCH_SIZE))
+    return time.perf_counter() - start
+
+
+def read(path, tuned, ready, stop, results):
+    conn = sqlite3.connect(path, timeout=5.0)
+    if tuned:
+        apply_pragmas(sqlite_utils.Database(conn))
+    rng = random.Random(0)
+    latencies = []
+    errors = 0
+    ready.set()
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            conn.execute(QUERY, [feed_url(rng.randrange(SEED_FEEDS))]).fetchall()
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    results.put((latencies, errors))
+
+
+def run(tuned, indexed):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        setup(path, tuned, indexed)
+
+        ready = multiprocessing.Event()
+        stop = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        reader = multiprocessing.Process(
+            target=read, args=(path, tuned, ready, stop, results)
+        )
+        reader.start()
+        elapsed = write(path, tuned, ready)
+        stop.set()
+        latencies, errors = results.get()
+        reader.join()
+
+    latencies.sort()
+    return elapsed, latencies, errors
+
+
+def main():
+    print(
+        f"{SEED_FEEDS * ENTRIES_PER_FEED:,} seeded entries, "
+        f"writing {BATCHES * BATCH_SIZE:,} more in {BATCHES} transactions"
+    )
+    print(
+        f"{'':>8}{'write s':>9}{'reads':>8}{'errors':>8}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for label, tuned, indexed in [
+        ("default", False, False),
+        ("indexed", False, True),
+        ("tuned", True, True),
+    ]:
+        elapsed, latencies, errors = run(tuned, indexed)
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{label:>8}{elapsed:>9.1f}{len(latencies):>8,}{errors:>8}"
+            f"{quantiles[49] * 1e3:>9.2f}{quantiles[94] * 1e3:>9.2f}"
+            f"{quantiles[98] * 1e3:>9.2f}{latencies[-1] * 1e3:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
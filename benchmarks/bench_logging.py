@@ -0,0 +1,110 @@
+"""
+Cost of standard library log records intercepted into loguru
+
+Logs N records (default 1,000,000) through `logging.getLogger("httpx").debug`, as
+httpx does per request, under each configuration:
+
+- filtered: loguru logs WARNING and up, so every record is discarded
+- unfiltered: loguru logs DEBUG, to stderr (/dev/null here) and a log file
+
+"before" is the previous `InterceptHandler` (a frame walk on every record, with the
+stdlib root logger passing everything through); "after" is `logging_config` as it is
+now, also with `enqueue=True` and a JSON log file. For queued sinks the time until
+the queue is drained is shown separately from the time the logging thread spent.
+
+    python benchmarks/bench_logging.py [N]
+"""
+
+import contextlib
+import inspect
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from prompthound.logconfig import DEFAULT_LOG_FORMAT, logging_config
+
+
+class OldInterceptHandler(logging.Handler):
+    "`InterceptHandler` before the level check and caller cache"
+
+    def emit(self, record):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        frame, depth = inspect.currentframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+
+        logger.opt(depth=depth, exception=record.exc_info).log(
+            level, record.getMessage()
+        )
+
+
+def configure_before(level, log_file):
+    logger.remove()
+    logger.add(sys.stderr, format=DEFAULT_LOG_FORMAT, level=level)
+    logger.add(log_file, format=DEFAULT_LOG_FORMAT, level=level)
+    logging.basicConfig(handlers=[OldInterceptHandler()], level=0, force=True)
+
+
+def configure_after(level, log_file, **kwargs):
+    logging_config(log_level=level, log_file=log_file, **kwargs)
+
+
+def run(n, configure, level, **kwargs):
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = str(Path(tmp) / "bench.log")
+        configure(level, log_file, **kwargs)
+        log = logging.getLogger("httpx")
+
+        start = time.perf_counter()
+        for i in range(n):
+            log.debug("HTTP Request: GET %s %s", "https://example.com/feed", i)
+        logged = time.perf_counter() - start
+        logger.complete()
+        drained = time.perf_counter() - start
+
+        logger.remove()
+        size = os.path.getsize(log_file)
+    return logged, drained, size
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{n:,} records")
+
+    cases = [
+        ("filtered", "before", configure_before, "WARNING", {}),
+        ("filtered", "after", configure_after, "WARNING", {}),
+        ("unfiltered", "before", configure_before, "DEBUG", {}),
+        ("unfiltered", "after", configure_after, "DEBUG", {}),
+        (
+            "unfiltered",
+            "after, enqueue + JSON",
+            configure_after,
+            "DEBUG",
+            dict(enqueue=True, serialize=True),
+        ),
+    ]
+
+    print(f"{'':>12}{'':>24}{'µs/record':>11}{'drained':>10}{'log MB':>9}")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        results = [(case, run(n, *case[2:4], **case[4])) for case in cases]
+
+    for (kind, label, *_), (logged, drained, size) in results:
+        print(
+            f"{kind:>12}{label:>24}{logged / n * 1e6:>11.2f}"
+            f"{drained:>9.1f}s{size / 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
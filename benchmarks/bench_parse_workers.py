@@ -0,0 +1,70 @@
+"""
+Ingest throughput of the pipelined engine as parse workers are added
+
+Writes the RSS snapshots from tests/data/sample_rss.tar.gz to a temporary directory
+(repeated with --copies to make a bigger corpus) and ingests them as local files with
+`ingest_feeds(..., workers=N)`. Parsing dominates, so throughput should grow close to
+linearly with N until N reaches the number of cores, when the single writer and the
+main process become the limit.
+
+    python benchmarks/bench_parse_workers.py --copies 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from corpus import sample_feeds
+
+from prompthound.vendor.feed_to_sqlite.aio import ingest_feeds
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=2)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, cores, cores * 2}),
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for copy in range(args.copies):
+            for name, content in sample_feeds():
+                path = Path(tmp) / f"{copy}-{name}"
+                path.write_bytes(content)
+                paths.append(str(path))
+        size = sum(os.path.getsize(p) for p in paths) / 1e6
+
+        print(f"{len(paths)} feeds, {size:.0f} MB, {cores} cores")
+        print(f"{'workers':>8} {'seconds':>9} {'feeds/s':>9} {'speedup':>9}")
+        baseline = None
+        for workers in args.workers:
+            db_path = Path(tmp) / f"bench-{workers}.db"
+            start = time.perf_counter()
+            results = ingest_feeds(
+                db_path,
+                paths,
+                table_name="entries",
+                concurrency=workers * 2,
+                workers=workers,
+                local_files=True,
+            )
+            elapsed = time.perf_counter() - start
+
+            assert all(r.status == "ok" for r in results), "some feeds failed"
+            baseline = baseline or elapsed
+            print(
+                f"{workers:>8} {elapsed:>9.2f} {len(paths) / elapsed:>9.1f} "
+                f"{baseline / elapsed:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
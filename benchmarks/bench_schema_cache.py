@@ -0,0 +1,82 @@
+"""
+SQLite statements issued per ingested feed, with and without the schema cache
+
+Ingests the RSS snapshots from tests/data/sample_rss.tar.gz into a fresh database and
+counts the statements SQLite sees, grouped by kind. The uncached run gives every
+lookup a cold `SchemaCache`, which reproduces the old one-query-per-lookup behaviour.
+
+    python benchmarks/bench_schema_cache.py
+"""
+
+import collections
+import tempfile
+import time
+from pathlib import Path
+
+import sqlite_utils
+from corpus import SAMPLE_RSS, sample_feeds
+
+from prompthound.vendor.feed_to_sqlite import ingest
+from prompthound.vendor.feed_to_sqlite.schema import SchemaCache
+
+
+def kind(sql):
+    sql = sql.lstrip().lower()
+    if sql.startswith("pragma"):
+        return "pragma"
+    if "sqlite_master" in sql:
+        return "sqlite_master"
+    return sql.split(None, 1)[0] if sql else "other"
+
+
+def run(feeds, cached):
+    original = ingest.schema_cache
+    if not cached:
+        ingest.schema_cache = SchemaCache
+
+    counts = collections.Counter()
+    entries = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = sqlite_utils.Database(Path(tmp) / "bench.db")
+            db.conn.set_trace_callback(lambda sql: counts.update([kind(sql)]))
+            start = time.perf_counter()
+            for _, content in feeds:
+                result = ingest.ingest_feed(
+                    db, feed_content=content, table_name="entries"
+                )
+                entries += result.entries
+            elapsed = time.perf_counter() - start
+            db.conn.set_trace_callback(None)
+    finally:
+        ingest.schema_cache = original
+
+    return counts, entries, elapsed
+
+
+def main():
+    feeds = sample_feeds()
+    print(f"{len(feeds)} feeds from {SAMPLE_RSS.name}")
+
+    results = {
+        label: run(feeds, cached)
+        for label, cached in [
+            ("uncached", False),
+            ("cached", True),
+        ]
+    }
+
+    kinds = sorted(set().union(*(counts for counts, _, _ in results.values())))
+    print(
+        f"{'statements/feed':>16}"
+        + "".join(f"{k:>15}" for k in kinds)
+        + f"{'total':>10}{'seconds':>10}"
+    )
+    for label, (counts, entries, elapsed) in results.items():
+        row = "".join(f"{counts[k] / len(feeds):>15.1f}" for k in kinds)
+        total = sum(counts.values()) / len(feeds)
+        print(f"{label:>16}{row}{total:>10.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
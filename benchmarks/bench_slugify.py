@@ -0,0 +1,91 @@
+"""
+Slugify throughput on real feed and entry titles
+
+Collects every feed and entry title from the test corpus and slugifies them with the
+options `ingest` uses for table names, comparing plain `Slugify` with `FastSlugify`
+both cold (cache cleared before every pass, so only the ASCII shortcut helps) and warm
+(titles repeat, as they do when the same feeds are polled again). A separate run
+times `join_words` against the old quadratic version on long word lists.
+
+    python benchmarks/bench_slugify.py
+"""
+
+import time
+
+import feedparser
+from corpus import archive_feeds, sample_feeds
+
+from prompthound.vendor.slugify import FastSlugify, Slugify
+from prompthound.vendor.slugify.main import join_words
+
+OPTIONS = dict(to_lower=True, separator="_", max_length=100)
+PASSES = 5
+
+
+def titles():
+    result = []
+    for _, content in sample_feeds() + archive_feeds():
+        f = feedparser.parse(content)
+        result.append(f.feed.get("title", ""))
+        result.extend(entry.get("title", "") for entry in f.entries)
+    return result
+
+
+def timed(slugify, texts, clear=None):
+    start = time.perf_counter()
+    for _ in range(PASSES):
+        if clear:
+            clear()
+        for text in texts:
+            slugify(text)
+    return (time.perf_counter() - start) / (PASSES * len(texts))
+
+
+def old_join_words(words, separator, max_length=None):
+    if not max_length:
+        return separator.join(words)
+    words = iter(words)
+    try:
+        text = next(words)
+    except StopIteration:
+        return ""
+    for word in words:
+        if len(text + separator + word) <= max_length:
+            text += separator + word
+    return text[:max_length]
+
+
+def main():
+    texts = titles()
+    print(f"{len(texts)} titles, {len(set(texts))} distinct")
+
+    slow = Slugify(**OPTIONS)
+    fast = FastSlugify(**OPTIONS)
+    assert [fast(t) for t in texts] == [slow(t) for t in texts]
+
+    rows = [
+        ("Slugify", timed(slow, texts)),
+        ("FastSlugify, cold", timed(fast, texts, fast._cached.cache_clear)),
+        ("FastSlugify, warm", timed(fast, texts)),
+    ]
+    baseline = rows[0][1]
+    print(f"{'':>20}{'µs/title':>10}{'speedup':>10}")
+    for label, seconds in rows:
+        print(f"{label:>20}{seconds * 1e6:>10.2f}{baseline / seconds:>9.1f}x")
+
+    print()
+    print(f"{'join_words words':>20}{'old ms':>10}{'new ms':>10}")
+    for n in (100, 1_000, 10_000):
+        words = ["word"] * n
+        for label, func in (("old", old_join_words), ("new", join_words)):
+            start = time.perf_counter()
+            func(words, "-", n * 5)
+            if label == "old":
+                old = time.perf_counter() - start
+            else:
+                new = time.perf_counter() - start
+        print(f"{n:>20}{old * 1e3:>10.2f}{new * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
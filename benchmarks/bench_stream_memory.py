@@ -0,0 +1,127 @@
+"""
+Peak memory of `ingest_feed` vs. `ingest_feed_streaming` as feed size grows
+
+Generates RSS feeds of increasing size, serves them from a local HTTP server and
+ingests each one in a fresh child process, reporting the child's peak RSS above its
+baseline after imports. The streaming path should stay flat; `ingest_feed` grows with
+the feed.
+
+    python benchmarks/bench_stream_memory.py --sizes 10 50 100
+"""
+
+import argparse
+import functools
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ITEM = (
+    "<item><title>Entry {n}</title><link>http://example.com/{n}</link>"
+    "<guid>http://example.com/{n}</guid>"
+    "<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>"
+    "<description>{body}</description></item>\n"
+)
+
+
+def write_feed(path, megabytes):
+    body = "lorem ipsum dolor sit amet " * 40
+    target = megabytes * 1024 * 1024
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0"?><rss version="2.0"><channel>')
+        f.write("<title>Big Feed</title><link>http://example.com/</link>\n")
+        n = 0
+        while f.tell() < target:
+            f.write(ITEM.format(n=n, body=body))
+            n += 1
+        f.write("</channel></rss>\n")
+    return n
+
+
+def serve(directory):
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(Handler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(mode, url, db_path):
+    from prompthound.vendor.feed_to_sqlite.ingest import ingest_feed
+    from prompthound.vendor.feed_to_sqlite.stream import ingest_feed_streaming
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "streaming":
+        result = ingest_feed_streaming(db_path, url=url, table_name="entries")
+    else:
+        result = ingest_feed(db_path, url=url, table_name="entries")
+    elapsed = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "entries": result.entries,
+                "peak_mb": peak_rss_mb() - baseline,
+                "seconds": elapsed,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--modes", nargs="+", default=["ingest_feed", "streaming"])
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(*args.child)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server = serve(tmp)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        print(
+            f"{'feed MB':>8} {'entries':>8} {'mode':>12} {'peak MB':>9} {'seconds':>9}"
+        )
+        for size in args.sizes:
+            write_feed(tmp / f"feed-{size}.xml", size)
+            for mode in args.modes:
+                db_path = tmp / f"{mode}-{size}.db"
+                out = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--child",
+                        mode,
+                        f"{base}/feed-{size}.xml",
+                        str(db_path),
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                stats = json.loads(out.strip().splitlines()[-1])
+                print(
+                    f"{size:>8} {stats['entries']:>8} {mode:>12} "
+                    f"{stats['peak_mb']:>9.1f} {stats['seconds']:>9.2f}"
+                )
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
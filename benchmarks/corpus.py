@@ -0,0 +1,29 @@
+"""
+Real feed documents for the benchmarks, from the test data directory
+"""
+
+import tarfile
+from pathlib import Path
+
+DATA = Path(__file__).resolve().parent.parent / "tests" / "data"
+
+SAMPLE_RSS = DATA / "sample_rss.tar.gz"
+ARCHIVES = [
+    DATA / "Pluralistic_archive_sample.xml",
+    DATA / "Pluralistic_archive_sample_lxml.xml",
+]
+
+
+def sample_feeds():
+    "(name, bytes) for each RSS snapshot in sample_rss.tar.gz"
+    with tarfile.open(SAMPLE_RSS) as tar:
+        return [
+            (member.name, tar.extractfile(member).read())
+            for member in tar.getmembers()
+            if member.isfile()
+        ]
+
+
+def archive_feeds():
+    "(name, bytes) for the larger WordPress export archives"
+    return [(path.name, path.read_bytes()) for path in ARCHIVES]
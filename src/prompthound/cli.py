@@ -1,15 +1,68 @@
 import sys
-from pathlib import Path
 import click
-import platformdirs
-import sqlite_utils
-from rich.console import Console
-from loguru import logger
-from .vendor.feed_to_sqlite.ingest import get_feeds_table
-from .logconfig import logging_config, LOGURU_LEVEL_NAMES
+from .database import app_paths, open_db, prepare_entry_tables, set_setting
+from .lazy_group import LazyGroup
+from .logconfig import LOGURU_LEVEL_NAMES
 
+# Commands with heavy dependencies live in their own modules and are only imported
+# when they run; keep this module's imports cheap, since `prompthound --help` and
+# `init --dry-run` are run from cron jobs and shell hooks.
+LAZY_SUBCOMMANDS = {
+    "import-opml": (
+        "prompthound.commands.import_opml.import_opml",
+        "Ingest every feed listed in an OPML file into the prompthound database.",
+    ),
+    "stats": (
+        "prompthound.commands.stats.stats",
+        "Show ingest latency percentiles per stage and the slowest feeds.",
+    ),
+    "db": (
+        "prompthound.commands.db.db",
+        "Maintain the prompthound database.",
+    ),
+}
 
-@click.group()
+
+class AppContext(dict):
+    """
+    The `ctx.obj` shared by every command
+
+    The logger and console are set up the first time a command looks them up, so
+    commands that don't log or print don't import loguru or rich.
+    """
+
+    def __init__(self, log_level, log_file, log_json=False, log_enqueue=False):
+        super().__init__()
+        self.log_level = log_level
+        self.log_file = log_file
+        self.log_json = log_json
+        self.log_enqueue = log_enqueue
+
+    def __missing__(self, key):
+        if key == "LOGGER":
+            from .logconfig import logging_config
+
+            value = logging_config(
+                log_level=self.log_level,
+                log_file=self.log_file,
+                enqueue=self.log_enqueue,
+                serialize=self.log_json,
+            )
+            value.info(f"Log level set to {self.log_level}")
+        elif key == "CONSOLE":
+            from rich.console import Console
+
+            # messages carry their own markup; repr highlighting compiles a dozen
+            # regexes on first use
+            value = Console(file=sys.stderr, highlight=False)
+        else:
+            raise KeyError(key)
+
+        self[key] = value
+        return value
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_SUBCOMMANDS)
 @click.option(
     "--log-level",
     "log_level",
@@ -25,20 +78,54 @@ from .logconfig import logging_config, LOGURU_LEVEL_NAMES
     default=None,
     help="Path to a file for logging.",
 )
+@click.option(
+    "--log-json",
+    "log_json",
+    is_flag=True,
+    default=False,
+    help="Write the log file as JSON lines.",
+)
+@click.option(
+    "--log-enqueue",
+    "log_enqueue",
+    is_flag=True,
+    default=False,
+    help="Write log messages from a background thread.",
+)
+@click.option(
+    "--profile",
+    "profile",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    default=None,
+    help="Profile the command with cProfile and write the stats to this file.",
+)
 @click.pass_context
-def cli(ctx, log_level, log_file):
+def cli(ctx, log_level, log_file, log_json, log_enqueue, profile):
     """A command-line tool for interacting with the prompthound package."""
-    ctx.ensure_object(dict)
+    if profile:
+        start_profile(ctx, profile)
+
+    # Logging and the console are configured on first use
+    ctx.obj = AppContext(
+        log_level=log_level.upper(),
+        log_file=log_file,
+        log_json=log_json,
+        log_enqueue=log_enqueue,
+    )
+
+
+def start_profile(ctx, path):
+    """Profile the rest of the invocation, writing `pstats` output to `path` on exit."""
+    import cProfile
 
-    # Set up logging
-    logging_config(log_level=log_level.upper(), log_file=log_file)
-    logger.info(f"Log level set to {log_level}")
+    profiler = cProfile.Profile()
 
-    # Set up console
-    console = Console(file=sys.stderr)
+    def dump():
+        profiler.disable()
+        profiler.dump_stats(path)
 
-    ctx.obj["LOGGER"] = logger
-    ctx.obj["CONSOLE"] = console
+    ctx.call_on_close(dump)
+    profiler.enable()
 
 
 @cli.command()
@@ -59,37 +146,43 @@ def main(ctx):
     default=False,
     help="Show what actions would be taken without making changes.",
 )
+@click.option(
+    "--fts",
+    is_flag=True,
+    default=False,
+    help="Add a full-text search index over entry titles and descriptions.",
+)
 @click.pass_context
-def init(ctx, dry_run):
+def init(ctx, dry_run, fts):
     """Initialize the prompthound database."""
-    console = ctx.obj["CONSOLE"]
-    logger = ctx.obj["LOGGER"]
-    app_dir = Path(
-        platformdirs.user_data_dir("dev.pirateninja.prompthound", "pirateninja.dev")
-    )
-    db_path = app_dir / "prompthound.db"
+    app_dir, db_path = app_paths()
 
     if dry_run:
-        console.print("[bold cyan]-- Dry Run Mode --[/bold cyan]")
+        # plain click output: importing rich would double the start-up time of a
+        # command that's run from cron jobs and shell hooks
+        def echo(icon, label, text="", color="yellow"):
+            click.echo(f"{icon} {click.style(label, fg=color)}{text}", err=True)
+
+        click.secho("-- Dry Run Mode --", fg="cyan", bold=True, err=True)
         if app_dir.exists():
-            console.print(f":white_check_mark: [green]Directory exists:[/] {app_dir}")
+            echo("\u2705", "Directory exists: ", app_dir, color="green")
         else:
-            console.print(
-                f":deciduous_tree: [yellow]Directory would be created:[/] {app_dir}"
-            )
+            echo("\U0001f333", "Directory would be created: ", app_dir)
 
         if db_path.exists():
-            console.print(f":white_check_mark: [green]Database exists:[/] {db_path}")
+            echo("\u2705", "Database exists: ", db_path, color="green")
         else:
-            console.print(
-                f":floppy_disk: [yellow]Database would be created:[/] {db_path}"
-            )
+            echo("\U0001f4be", "Database would be created: ", db_path)
+        if fts:
+            echo("\U0001f50d", "Full-text search would be enabled for entry tables")
         return
 
-    app_dir.mkdir(parents=True, exist_ok=True)
+    console = ctx.obj["CONSOLE"]
     console.print(f"Database path: {db_path}")
-    db = sqlite_utils.Database(db_path)
-    get_feeds_table(db)
+    db = open_db()
+    if fts:
+        set_setting(db, "fts", "on")
+    prepare_entry_tables(db)
     console.print("Database initialized successfully.", style="bold green")
 
 
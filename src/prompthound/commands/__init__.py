@@ -0,0 +1,3 @@
+"""
+Subcommands of the prompthound CLI that are loaded lazily by `lazy_group.LazyGroup`
+"""
@@ -0,0 +1,26 @@
+import click
+
+from ..database import app_paths, open_db, optimize_db
+
+
+@click.group()
+def db():
+    """Maintain the prompthound database."""
+
+
+@db.command()
+@click.option(
+    "--analyze",
+    is_flag=True,
+    default=False,
+    help="Run a full ANALYZE first, rather than only refreshing stale statistics.",
+)
+@click.pass_context
+def optimize(ctx, analyze):
+    """Refresh query planner statistics and optimize full-text indexes."""
+    console = ctx.obj["CONSOLE"]
+    _, db_path = app_paths()
+
+    optimize_db(open_db(), analyze=analyze)
+    ran = "ANALYZE and PRAGMA optimize" if analyze else "PRAGMA optimize"
+    console.print(f"Ran {ran} on {db_path}", style="bold green")
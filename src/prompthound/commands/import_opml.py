@@ -0,0 +1,113 @@
+import click
+import httpx
+
+from ..database import open_db, prepare_entry_tables
+from ..metrics import RunMetrics
+from ..vendor.feed_to_sqlite.aio import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_TIMEOUT,
+    ingest_feeds,
+)
+from ..vendor.feed_to_sqlite.ingest import IngestResult
+from ..vendor.feed_to_sqlite.stream import (
+    DEFAULT_MAX_BYTES,
+    ingest_feed_streaming,
+    iter_opml_urls,
+)
+
+
+@click.command(name="import-opml")
+@click.argument("opml", type=click.File("rb"))
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Number of feeds to fetch in parallel.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parse feeds in a pool of N processes.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Ingest one feed at a time with the bounded-memory streaming parser.",
+)
+@click.option(
+    "--max-bytes",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_BYTES,
+    show_default=True,
+    help="Skip feeds whose body is larger than this.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Ignore saved ETag/Last-Modified state and fetch every feed.",
+)
+@click.pass_context
+def import_opml(ctx, opml, concurrency, workers, stream, max_bytes, force):
+    """Ingest every feed listed in an OPML file into the prompthound database."""
+    console = ctx.obj["CONSOLE"]
+    logger = ctx.obj["LOGGER"]
+    db = open_db()
+
+    # URLs are read from the OPML file as the ingest pipeline asks for them
+    urls = iter_opml_urls(opml)
+
+    with RunMetrics(db, "import-opml") as run:
+        if stream:
+            results = []
+            # one pooled client for every feed, configured like `make_async_client`
+            with httpx.Client(
+                headers={"user-agent": "feed-to-sqlite"},
+                timeout=DEFAULT_TIMEOUT,
+                follow_redirects=True,
+            ) as client:
+                for url in urls:
+                    try:
+                        result = ingest_feed_streaming(
+                            db,
+                            url=url,
+                            client=client,
+                            conditional=not force,
+                            max_bytes=max_bytes,
+                        )
+                    except Exception as e:
+                        # as in the async pipeline, a failing feed doesn't stop the run
+                        result = IngestResult(url=url, status="error", error=str(e))
+                    results.append(result)
+        else:
+            results = ingest_feeds(
+                db,
+                urls,
+                conditional=not force,
+                concurrency=max(concurrency, workers or 1),
+                workers=workers,
+                max_bytes=max_bytes,
+            )
+    summary = run.save(results)
+    # index any entry tables the ingest created
+    prepare_entry_tables(db)
+
+    errors = [result for result in results if result.status == "error"]
+    for result in errors:
+        logger.warning(f"{result.url}: {result.error}")
+
+    console.print(
+        f"Ingested {len(results)} feeds: "
+        f"{sum(r.inserted for r in results)} new entries, "
+        f"{sum(r.updated for r in results)} updated, "
+        f"{sum(r.skipped for r in results)} feeds unchanged, "
+        f"{len(errors)} errors."
+    )
+    console.print(
+        f"{summary['bytes']:,} bytes fetched in {summary['seconds']:.1f}s, "
+        f"{summary['entries_per_second'] or 0:,.0f} entries/s, "
+        f"{summary['statements']:,} SQLite statements."
+    )
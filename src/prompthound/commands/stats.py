@@ -0,0 +1,86 @@
+import click
+from rich.table import Table
+
+from ..database import open_db
+from ..metrics import PERCENTILES, recent_runs, slowest_feeds, stage_percentiles
+
+
+def ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:,.1f}"
+
+
+@click.command()
+@click.option(
+    "--runs",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of recent ingest runs to include.",
+)
+@click.option(
+    "--slowest",
+    type=click.IntRange(min=0),
+    default=10,
+    show_default=True,
+    help="Number of slowest feeds to list.",
+)
+@click.pass_context
+def stats(ctx, runs, slowest):
+    """Show ingest latency percentiles per stage and the slowest feeds."""
+    console = ctx.obj["CONSOLE"]
+    db = open_db()
+
+    recent = recent_runs(db, limit=runs)
+    if not recent:
+        console.print("No ingest runs recorded yet.")
+        return
+
+    run_table = Table(title=f"Last {len(recent)} runs")
+    run_table.add_column("run", justify="right")
+    run_table.add_column("command")
+    run_table.add_column("started")
+    for column in ("feeds", "entries", "entries/s", "MB", "statements", "seconds"):
+        run_table.add_column(column, justify="right")
+    for run in recent:
+        run_table.add_row(
+            str(run["id"]),
+            run["command"],
+            run["started"],
+            f"{run['feeds']:,}",
+            f"{run['entries']:,}",
+            f"{run['entries_per_second'] or 0:,.0f}",
+            f"{run['bytes'] / 1e6:,.1f}",
+            f"{run['statements']:,}",
+            f"{run['seconds']:,.1f}",
+        )
+    console.print(run_table)
+
+    run_ids = [run["id"] for run in recent]
+    stage_table = Table(title="Stage latency (ms)")
+    stage_table.add_column("stage")
+    stage_table.add_column("feeds", justify="right")
+    for p in PERCENTILES:
+        stage_table.add_column(f"p{p}", justify="right")
+    for stage, values in stage_percentiles(db, run_ids).items():
+        if values["count"]:
+            stage_table.add_row(
+                stage, f"{values['count']:,}", *(ms(values[p]) for p in PERCENTILES)
+            )
+    console.print(stage_table)
+
+    if slowest:
+        feed_table = Table(title="Slowest feeds")
+        feed_table.add_column("url")
+        feed_table.add_column("status")
+        feed_table.add_column("entries", justify="right")
+        feed_table.add_column("KB", justify="right")
+        feed_table.add_column("total ms", justify="right")
+        for feed in slowest_feeds(db, run_ids, limit=slowest):
+            feed_table.add_row(
+                feed["url"],
+                feed["status"],
+                f"{feed['entries']:,}",
+                f"{(feed['bytes'] or 0) / 1e3:,.1f}",
+                ms(feed["total"]),
+            )
+        console.print(feed_table)
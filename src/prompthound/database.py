@@ -0,0 +1,122 @@
+"""
+Locating, opening and tuning the prompthound database
+
+Every connection gets the `PRAGMAS` performance profile: WAL, so readers (`stats`,
+ad-hoc queries, Datasette) neither block nor are blocked by an ingest, with
+`synchronous=NORMAL`, which is durable in WAL mode except for the last transactions
+before a power failure, a larger page cache and memory-mapped reads, and a busy
+timeout so a second writer waits for the lock instead of failing.
+
+Entry tables are indexed for "latest entries for a feed" and "recently updated"
+queries, and with `init --fts` also get an FTS5 index over their title and
+description, kept up to date by triggers.
+"""
+
+from pathlib import Path
+
+import platformdirs
+
+PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    # negative sizes are in KiB: 64 MiB
+    "cache_size": -64 * 1024,
+    "mmap_size": 256 * 1024 * 1024,
+    # milliseconds
+    "busy_timeout": 5000,
+}
+
+SETTINGS_TABLE = "settings"
+
+FTS_COLUMNS = ("title", "description")
+
+
+def app_paths():
+    """Return the application data directory and the database path inside it."""
+    app_dir = Path(
+        platformdirs.user_data_dir("dev.pirateninja.prompthound", "pirateninja.dev")
+    )
+    return app_dir, app_dir / "prompthound.db"
+
+
+def open_db():
+    """Open the prompthound database, creating it and its core tables if needed."""
+    import sqlite3
+
+    import sqlite_utils
+
+    from .vendor.feed_to_sqlite.ingest import get_feeds_table, get_fetch_state_table
+
+    app_dir, db_path = app_paths()
+    app_dir.mkdir(parents=True, exist_ok=True)
+    # the async ingest pipeline runs every query on its own writer thread
+    db = sqlite_utils.Database(sqlite3.connect(str(db_path), check_same_thread=False))
+    apply_pragmas(db)
+    get_feeds_table(db)
+    get_fetch_state_table(db)
+    return db
+
+
+def apply_pragmas(db):
+    """Apply the `PRAGMAS` performance profile to a connection."""
+    for name, value in PRAGMAS.items():
+        db.execute(f"pragma {name} = {value}")
+
+
+def get_setting(db, key, default=None):
+    """Read a value from the settings table."""
+    if not db[SETTINGS_TABLE].exists():
+        return default
+    row = db.execute(
+        f"select value from [{SETTINGS_TABLE}] where key = ?", [key]
+    ).fetchone()
+    return default if row is None else row[0]
+
+
+def set_setting(db, key, value):
+    """Store a value in the settings table."""
+    db[SETTINGS_TABLE].upsert({"key": key, "value": value}, pk="key")
+
+
+def entry_tables(db):
+    """Tables holding feed entries: those with a foreign key to the feeds table."""
+    from .vendor.feed_to_sqlite.ingest import FEEDS_TABLE
+
+    return [
+        table
+        for table in db.tables
+        if any(fk.other_table == FEEDS_TABLE for fk in table.foreign_keys)
+    ]
+
+
+def prepare_entry_tables(db):
+    """
+    Make sure every entry table has its indexes, and its full-text index if FTS is
+    enabled.
+
+    Run after ingesting, to pick up tables created by the ingest.
+    """
+    from .vendor.feed_to_sqlite.ingest import index_entries_table
+    from .vendor.feed_to_sqlite.schema import schema_cache
+
+    fts = get_setting(db, "fts") == "on"
+    for table in entry_tables(db):
+        index_entries_table(table)
+        if fts and not table.detect_fts():
+            # populates the index from existing rows; the triggers keep it current
+            table.enable_fts(FTS_COLUMNS, fts_version="FTS5", create_triggers=True)
+    schema_cache(db).invalidate()
+
+
+def optimize_db(db, analyze=False):
+    """
+    Refresh query planner statistics and merge full-text index segments.
+
+    `PRAGMA optimize` only analyzes tables whose statistics look stale; `analyze`
+    runs a full `ANALYZE` first.
+    """
+    if analyze:
+        db.execute("analyze")
+    db.execute("pragma optimize")
+    for table in entry_tables(db):
+        table.optimize()
@@ -0,0 +1,67 @@
+"""
+A click group whose subcommands are imported only when they're run
+
+Following the click documentation's "lazily loading subcommands" recipe, each
+subcommand is registered by import path, so `prompthound --help` or a cheap command
+doesn't pay for the imports of every other command. The short help shown in the
+group's `--help` is registered alongside, so listing commands doesn't import them
+either.
+"""
+
+import importlib
+
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    `click.Group` taking `lazy_subcommands={name: ("package.module.command", help)}`
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        # as `click.MultiCommand.format_commands`, but without loading lazy commands
+        names = self.list_commands(ctx)
+        if not names:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            if name in self.lazy_subcommands:
+                _, short_help = self.lazy_subcommands[name]
+                rows.append(
+                    (name, click.utils.make_default_short_help(short_help, limit))
+                )
+                continue
+
+            command = super().get_command(ctx, name)
+            if command is None or command.hidden:
+                continue
+            rows.append((name, command.get_short_help_str(limit)))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+    def _lazy_load(self, cmd_name):
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, _, attr = import_path.rpartition(".")
+        command = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"lazy loading of {import_path} did not return a click command: "
+                f"{command!r}"
+            )
+        return command
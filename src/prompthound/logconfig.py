@@ -7,14 +7,18 @@ This module provides helpers to configure loguru for application logging by:
 
 For use in application entry points, not libraries:
 https://loguru.readthedocs.io/en/stable/overview.html#suitable-for-scripts-and-libraries
+
+loguru itself is imported when logging is configured rather than with this module, so
+the CLI can read `LOGURU_LEVEL_NAMES` without paying for it.
 """
 
-import inspect
 import logging
 import sys
-from typing import Optional, Union
+from types import CodeType
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
 
-from loguru import logger
+if TYPE_CHECKING:
+    from loguru import Logger
 
 DEFAULT_LOG_FORMAT = "<y>{level:<7}</y>|{process.id:>8}|{elapsed}|{time:YYYY-MM-DD HH:mm:ssZ!UTC}|{name}|{function}|{message}"
 
@@ -32,8 +36,24 @@ LOGURU_LEVEL_NAMES = [
 class InterceptHandler(logging.Handler):
     """
     Handler to intercept standard library logging and redirect to loguru.
+
+    Set the handler's level (as `logging_config` does) to drop records loguru would
+    discard before doing any work on them. The number of frames between `emit` and
+    the code that logged is cached per logger name and call site, and checked against
+    the caller's code object, so the frame walk only runs once per call site.
     """
 
+    # call sites remembered before the cache is cleared
+    MAX_CALLERS = 4096
+
+    def __init__(self, level: Union[str, int] = logging.NOTSET) -> None:
+        from loguru import logger
+
+        super().__init__(level)
+        self.logger = logger
+        self._levels: Dict[str, Union[str, int]] = {}
+        self._callers: Dict[Tuple[str, str, int], Tuple[int, CodeType]] = {}
+
     def emit(self, record: logging.LogRecord) -> None:
         """
         Processes log records by forwarding them to loguru. Maps standard library log levels to loguru levels and
@@ -45,34 +65,69 @@ class InterceptHandler(logging.Handler):
         # Get the corresponding Loguru level if it exists
         level: Union[str, int]
         try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+            level = self._levels[record.levelname]
+        except KeyError:
+            try:
+                level = self.logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelname] = level
+
+        self.logger.opt(
+            depth=self._caller_depth(record), exception=record.exc_info
+        ).log(level, record.getMessage())
+
+    def _caller_depth(self, record: logging.LogRecord) -> int:
+        """
+        Number of frames from `emit` up to the code that logged `record`.
+
+        @param record: The logging.LogRecord being emitted
+        @return: The depth to pass to `logger.opt`
+        """
+        key = (record.name, record.pathname, record.lineno)
+        cached = self._callers.get(key)
+        if cached is not None:
+            depth, code = cached
+            try:
+                # + 1 for this method's own frame
+                if sys._getframe(depth + 1).f_code is code:
+                    return depth
+            except ValueError:
+                pass
 
         # Find caller from where originated the logged message
-        frame, depth = inspect.currentframe(), 0
+        frame, depth = sys._getframe(1), 0
         while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
             frame = frame.f_back
             depth += 1
 
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
-        )
+        if frame:
+            if len(self._callers) >= self.MAX_CALLERS:
+                self._callers.clear()
+            self._callers[key] = (depth, frame.f_code)
+        return depth
 
 
 def logging_config(
     log_format: str = DEFAULT_LOG_FORMAT,
     log_level: str = "INFO",
     log_file: Optional[str] = None,
-) -> logger:
+    enqueue: bool = False,
+    serialize: bool = False,
+) -> "Logger":
     """
     Configures loguru for application logging.
 
     @param log_format: Format string for log messages.
     @param log_level: Minimum level to log.
     @param log_file: Optional file path to write logs.
+    @param enqueue: Hand messages to a background thread instead of writing them from
+        the thread that logged; queued messages are flushed when the process exits.
+    @param serialize: Write the log file as JSON lines, one record per line.
     @return: Configured logger instance.
     """
+    from loguru import logger
+
     logger.remove()  # Remove default handlers
 
     # Configure stderr as the primary log sink
@@ -83,6 +138,7 @@ def logging_config(
                 "colorize": True,
                 "format": log_format,
                 "level": log_level,
+                "enqueue": enqueue,
             },
         ]
     }
@@ -90,16 +146,32 @@ def logging_config(
     # Add file logging if specified
     if log_file:
         log_config["handlers"].append(
-            {"sink": log_file, "format": log_format, "level": log_level},
+            {
+                "sink": log_file,
+                "format": log_format,
+                "level": log_level,
+                "enqueue": enqueue,
+                "serialize": serialize,
+            },
         )
 
     # Apply configuration
     logger.configure(**log_config)
 
+    # Standard library records below this are dropped before they reach loguru
+    threshold = logger.level(log_level).no
+
     # Check if standard library logging is already intercepted
-    if not any(isinstance(h, InterceptHandler) for h in logging.getLogger().handlers):
+    root = logging.getLogger()
+    handler = next((h for h in root.handlers if isinstance(h, InterceptHandler)), None)
+    if handler:
+        handler.setLevel(threshold)
+        root.setLevel(threshold)
+    else:
         # Intercept standard library logging if it is not already intercepted
-        logging.basicConfig(handlers=[InterceptHandler()], force=True)
-        logger.info(f"logging package root handlers: {logging.getLogger().handlers}")
+        logging.basicConfig(
+            handlers=[InterceptHandler(threshold)], level=threshold, force=True
+        )
+        logger.info(f"logging package root handlers: {root.handlers}")
 
     return logger
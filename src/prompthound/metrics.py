@@ -0,0 +1,226 @@
+"""
+Ingest metrics kept in the prompthound database
+
+Every ingest run (e.g. `prompthound import-opml`) records:
+
+- a row in `metrics_runs`: feed and entry totals, bytes fetched, entries per second,
+  the number of SQLite statements executed and a latency histogram per stage
+- a row per feed in `metrics_feeds`: its status, size and seconds per stage (see
+  `feed_to_sqlite.timings`)
+
+`prompthound stats` reads them back.
+"""
+
+import datetime
+import json
+import math
+import time
+
+from .vendor.feed_to_sqlite.timings import STAGES
+
+RUNS_TABLE = "metrics_runs"
+FEEDS_TABLE = "metrics_feeds"
+
+# upper bounds of the latency histogram buckets, in seconds; the last bucket is
+# everything slower
+HISTOGRAM_BUCKETS = (
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1,
+    2,
+    5,
+    10,
+    30,
+    60,
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+class RunMetrics:
+    """
+    Metrics for one ingest run against `db`
+
+    Use as a context manager around the run, which times it and counts the SQLite
+    statements executed on `db`, then pass the `IngestResult`s to `save`.
+    """
+
+    def __init__(self, db, command):
+        self.db = db
+        self.command = command
+        self.statements = 0
+        self.started = None
+        self.seconds = None
+
+    def __enter__(self):
+        self.started = datetime.datetime.now(datetime.timezone.utc)
+        self._start = time.perf_counter()
+        self.db.conn.set_trace_callback(self._count)
+        return self
+
+    def __exit__(self, *exc):
+        self.db.conn.set_trace_callback(None)
+        self.seconds = time.perf_counter() - self._start
+
+    def _count(self, sql):
+        self.statements += 1
+
+    def save(self, results):
+        "Store the run summary and per-feed rows; returns the summary row"
+        results = list(results)
+        entries = sum(r.entries for r in results)
+        timings = [r.timings or {} for r in results]
+        summary = {
+            "command": self.command,
+            "started": self.started.isoformat(),
+            "seconds": self.seconds,
+            "feeds": len(results),
+            "errors": sum(r.status == "error" for r in results),
+            "skipped": sum(r.skipped for r in results),
+            "entries": entries,
+            "inserted": sum(r.inserted for r in results),
+            "updated": sum(r.updated for r in results),
+            "bytes": sum(r.bytes for r in results),
+            "entries_per_second": entries / self.seconds if self.seconds else None,
+            "statements": self.statements,
+            "histograms": json.dumps(
+                {
+                    stage: histogram(t[stage] for t in timings if stage in t)
+                    for stage in STAGES
+                }
+            ),
+        }
+
+        with self.db.conn:
+            run_id = get_runs_table(self.db).insert(summary).last_pk
+            get_feed_metrics_table(self.db).insert_all(
+                {
+                    "run": run_id,
+                    "url": result.url,
+                    "status": result.status,
+                    "error": result.error,
+                    "bytes": result.bytes,
+                    "entries": result.entries,
+                    **{stage: t.get(stage) for stage in STAGES},
+                }
+                for result, t in zip(results, timings)
+            )
+
+        return dict(summary, id=run_id)
+
+
+def histogram(values):
+    "Counts of `values` per `HISTOGRAM_BUCKETS` bucket, plus one for anything slower"
+    counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+    for value in values:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+def percentile(values, p):
+    "The nearest-rank `p`th percentile of sorted `values`"
+    if not values:
+        return None
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def get_runs_table(db):
+    table = db[RUNS_TABLE]
+    if not table.exists():
+        table.create(
+            {
+                "id": int,
+                "command": str,
+                "started": str,
+                "seconds": float,
+                "feeds": int,
+                "errors": int,
+                "skipped": int,
+                "entries": int,
+                "inserted": int,
+                "updated": int,
+                "bytes": int,
+                "entries_per_second": float,
+                "statements": int,
+                "histograms": str,
+            },
+            pk="id",
+        )
+    return table
+
+
+def get_feed_metrics_table(db):
+    table = db[FEEDS_TABLE]
+    if not table.exists():
+        get_runs_table(db)
+        table.create(
+            {
+                "run": int,
+                "url": str,
+                "status": str,
+                "error": str,
+                "bytes": int,
+                "entries": int,
+                **{stage: float for stage in STAGES},
+            },
+            foreign_keys=[("run", RUNS_TABLE, "id")],
+        )
+        table.create_index(["run"])
+    return table
+
+
+def recent_runs(db, limit=10):
+    "The last `limit` runs, newest first"
+    return list(get_runs_table(db).rows_where(order_by="id desc", limit=limit))
+
+
+def stage_percentiles(db, run_ids):
+    """
+    `{stage: {"count": n, 50: seconds, 95: seconds, 99: seconds}}` over the feeds of
+    the runs in `run_ids`
+    """
+    feeds = get_feed_metrics_table(db)
+    where, params = _in_runs(run_ids)
+    stats = {}
+    for stage in STAGES:
+        values = [
+            row[0]
+            for row in db.execute(
+                f"select [{stage}] from [{feeds.name}] "
+                f"where {where} and [{stage}] is not null order by [{stage}]",
+                params,
+            )
+        ]
+        stats[stage] = {"count": len(values)}
+        stats[stage].update((p, percentile(values, p)) for p in PERCENTILES)
+    return stats
+
+
+def slowest_feeds(db, run_ids, limit=10):
+    "The feeds with the highest total time in the runs in `run_ids`"
+    where, params = _in_runs(run_ids)
+    return list(
+        get_feed_metrics_table(db).rows_where(
+            f"{where} and total is not null",
+            params,
+            order_by="total desc",
+            limit=limit,
+        )
+    )
+
+
+def _in_runs(run_ids):
+    run_ids = list(run_ids)
+    return "run in ({})".format(", ".join("?" * len(run_ids)) or "null"), run_ids
@@ -0,0 +1,21 @@
+import pytest
+
+
+def rss(n=0, entries=3, title="Stub Feed"):
+    items = "".join(
+        f"<item><title>Post {n}-{i}</title><link>http://example.com/{n}/{i}</link>"
+        f"<guid>http://example.com/{n}/{i}</guid>"
+        f"<pubDate>Mon, 0{i % 9 + 1} Jan 2024 00:00:00 GMT</pubDate></item>"
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel>'
+        f"<title>{title}</title><link>http://example.com/</link>{items}"
+        "</channel></rss>"
+    )
+
+
+@pytest.fixture
+def make_rss():
+    """Factory for small RSS 2.0 documents: make_rss(n, entries=3, title=...)"""
+    return rss
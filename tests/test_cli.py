@@ -29,6 +29,7 @@ def test_cli_init(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
 
     db = sqlite_utils.Database(db_path)
     assert "feeds" in db.table_names()
+    assert db.execute("pragma journal_mode").fetchone()[0] == "wal"
 
     assert "Database initialized successfully." in result.output
 
@@ -69,3 +70,215 @@ def test_cli_init_dry_run_dir_exists(tmp_path: Path, monkeypatch: pytest.MonkeyP
 
     assert "Directory exists" in result.output
     assert "Database would be created" in result.output
+
+
+def serve_feeds(monkeypatch: pytest.MonkeyPatch, files, redirects=None):
+    """Answer ingest requests from local files, keyed by URL path.
+
+    Returns the list of requests served, and of the sync clients created.
+    """
+    import httpx
+
+    requests = []
+    clients = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path in (redirects or {}):
+            location = redirects[request.url.path]
+            return httpx.Response(301, headers={"Location": location})
+        path = files.get(request.url.path)
+        if path is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=path.read_bytes())
+
+    client_class = httpx.Client
+
+    def make_client(**kwargs):
+        client = client_class(transport=httpx.MockTransport(handler), **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(
+        "prompthound.vendor.feed_to_sqlite.aio.make_async_client",
+        lambda **kwargs: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(httpx, "Client", make_client)
+    return requests, clients
+
+
+def test_cli_import_opml(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test the import-opml CLI command with served feed files."""
+
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+
+    feed = Path(__file__).parent / "data" / "Pluralistic_archive_sample.xml"
+    serve_feeds(monkeypatch, {f"/{feed.name}": feed})
+    opml = tmp_path / "subs.opml"
+    opml.write_text(
+        '<?xml version="1.0"?><opml version="2.0"><body>'
+        f'<outline text="Pluralistic" xmlUrl="http://feeds.test/{feed.name}"/>'
+        '<outline text="Missing" xmlUrl="http://feeds.test/missing.xml"/>'
+        "</body></opml>"
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["import-opml", str(opml)])
+    assert result.exit_code == 0, result.output
+    assert "Ingested 2 feeds: 91 new entries" in result.output
+    assert "1 errors" in result.output
+
+    db = sqlite_utils.Database(tmp_path / "prompthound.db")
+    assert db["feeds"].count == 1
+
+    # the run and each feed are recorded in the metrics tables
+    (run,) = db["metrics_runs"].rows
+    assert (run["feeds"], run["errors"], run["entries"]) == (2, 1, 91)
+    assert run["bytes"] == feed.stat().st_size
+    assert run["statements"] > 0
+    assert db["metrics_feeds"].count == 2
+
+    result = runner.invoke(cli, ["stats"], env={"COLUMNS": "200"})
+    assert result.exit_code == 0, result.output
+    assert "Stage latency" in result.output
+    assert "p99" in result.output
+    assert "Slowest feeds" in result.output
+    assert "Pluralistic_archive_sample.xml" in result.output
+
+
+def test_cli_import_opml_stream(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test import-opml --stream shares one client that follows redirects."""
+
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+
+    feed = Path(__file__).parent / "data" / "Pluralistic_archive_sample.xml"
+    requests, clients = serve_feeds(
+        monkeypatch, {"/new.xml": feed}, redirects={"/old.xml": "/new.xml"}
+    )
+    opml = tmp_path / "subs.opml"
+    opml.write_text(
+        '<?xml version="1.0"?><opml version="2.0"><body>'
+        '<outline text="Moved" xmlUrl="http://feeds.test/old.xml"/>'
+        '<outline text="Missing" xmlUrl="http://feeds.test/missing.xml"/>'
+        "</body></opml>"
+    )
+
+    result = CliRunner().invoke(cli, ["import-opml", "--stream", str(opml)])
+    assert result.exit_code == 0, result.output
+    assert "Ingested 2 feeds: 91 new entries" in result.output
+    assert "1 errors" in result.output
+
+    assert len(clients) == 1 and clients[0].is_closed
+    assert {r.headers["user-agent"] for r in requests} == {"feed-to-sqlite"}
+
+
+def test_cli_import_opml_stream_untitled_feed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_rss
+):
+    """Test that import-opml --stream records an untitled feed as an error."""
+
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+
+    untitled = tmp_path / "untitled.xml"
+    untitled.write_text(make_rss().replace("<title>Stub Feed</title>", ""))
+    titled = tmp_path / "titled.xml"
+    titled.write_text(make_rss(1))
+    requests, _ = serve_feeds(
+        monkeypatch, {"/untitled.xml": untitled, "/titled.xml": titled}
+    )
+    opml = tmp_path / "subs.opml"
+    opml.write_text(
+        '<?xml version="1.0"?><opml version="2.0"><body>'
+        '<outline text="Untitled" xmlUrl="http://feeds.test/untitled.xml"/>'
+        '<outline text="Titled" xmlUrl="http://feeds.test/titled.xml"/>'
+        "</body></opml>"
+    )
+
+    result = CliRunner().invoke(cli, ["import-opml", "--stream", str(opml)])
+    assert result.exit_code == 0, result.output
+    assert "Ingested 2 feeds: 3 new entries" in result.output
+    assert "1 errors" in result.output
+    assert len(requests) == 2
+
+    db = sqlite_utils.Database(tmp_path / "prompthound.db")
+    (run,) = db["metrics_runs"].rows
+    assert (run["feeds"], run["errors"]) == (2, 1)
+
+
+def test_cli_stats_without_runs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test the stats CLI command before anything has been ingested."""
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+
+    result = CliRunner().invoke(cli, ["stats"])
+    assert result.exit_code == 0, result.output
+    assert "No ingest runs recorded yet." in result.output
+
+
+def test_cli_profile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that --profile writes cProfile stats for the command."""
+    import pstats
+
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+    profile = tmp_path / "init.prof"
+
+    result = CliRunner().invoke(cli, ["--profile", str(profile), "init"])
+    assert result.exit_code == 0, result.output
+
+    stats = pstats.Stats(str(profile))
+    assert any(func == "open_db" for _, _, func in stats.stats)
+
+
+def test_cli_init_fts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_rss):
+    """Test that init --fts indexes entry tables and keeps the index current."""
+    from prompthound.vendor.feed_to_sqlite.ingest import ingest_feed
+
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+    db_path = tmp_path / "prompthound.db"
+
+    runner = CliRunner()
+    assert runner.invoke(cli, ["init"]).exit_code == 0
+    # an entry table created before FTS is turned on
+    ingest_feed(db_path, feed_content=make_rss(entries=3), table_name="posts")
+
+    result = runner.invoke(cli, ["init", "--fts"])
+    assert result.exit_code == 0, result.output
+
+    db = sqlite_utils.Database(db_path)
+    posts = db["posts"]
+    assert {tuple(index.columns) for index in posts.indexes} >= {
+        ("feed", "published"),
+        ("updated",),
+    }
+    assert posts.detect_fts() == "posts_fts"
+    assert [row["id"] for row in posts.search("Post 0-1", quote=True)][
+        0
+    ] == "http://example.com/0/1"
+
+    # new and changed entries are indexed as they're written
+    feed = make_rss(entries=4).replace("Post 0-2", "Post 0-2 corrected")
+    ingest_feed(db_path, feed_content=feed, table_name="posts")
+    assert [row["id"] for row in posts.search("corrected")] == [
+        "http://example.com/0/2"
+    ]
+    assert [row["id"] for row in posts.search("Post 0-3", quote=True)][
+        0
+    ] == "http://example.com/0/3"
+
+
+def test_cli_db_optimize(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_rss):
+    """Test the db optimize CLI command."""
+    from prompthound.vendor.feed_to_sqlite.ingest import ingest_feed
+
+    monkeypatch.setattr("platformdirs.user_data_dir", lambda *a, **k: str(tmp_path))
+    db_path = tmp_path / "prompthound.db"
+
+    runner = CliRunner()
+    assert runner.invoke(cli, ["init", "--fts"]).exit_code == 0
+    ingest_feed(db_path, feed_content=make_rss(entries=20), table_name="posts")
+
+    result = runner.invoke(cli, ["db", "optimize", "--analyze"])
+    assert result.exit_code == 0, result.output
+    assert "Ran ANALYZE and PRAGMA optimize" in result.output
+
+    db = sqlite_utils.Database(db_path)
+    assert "sqlite_stat1" in db.table_names()
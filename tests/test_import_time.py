@@ -0,0 +1,104 @@
+"""
+Startup cost of the CLI's cheap paths
+
+`prompthound --help` and `prompthound init --dry-run` are run from cron jobs and
+shell hooks, so they mustn't import the ingest stack, the LLM libraries or rich, and
+must start quickly. Each check runs in a fresh interpreter, since this test process
+has already imported everything.
+
+Wall-clock time depends on the machine, so the budget is the time allowed on top of a
+baseline: importing click and running an empty command in the same interpreter.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# seconds from importing prompthound.cli to the command finishing, over the baseline
+STARTUP_BUDGET = 0.1
+
+HEAVY_MODULES = [
+    "asyncio",
+    "feedparser",
+    "httpx",
+    "llm",
+    "loguru",
+    "pydantic_ai",
+    "regex",
+    "rich",
+    "sqlite_utils",
+    "unidecode",
+]
+
+SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+from prompthound.cli import cli
+
+cli(sys.argv[1:], standalone_mode=False)
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+BASELINE_SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+import click
+
+click.command()(lambda: None)([], standalone_mode=False)
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_cli(args, tmp_path, script=SCRIPT):
+    env = dict(os.environ, XDG_DATA_HOME=str(tmp_path))
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("args", [["--help"], ["init", "--dry-run"]])
+def test_cli_startup(args, tmp_path):
+    runs = []
+    baselines = []
+    for _ in range(5):
+        runs.append(run_cli(args, tmp_path))
+        baselines.append(run_cli([], tmp_path, script=BASELINE_SCRIPT))
+
+    modules = set(runs[0]["modules"])
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+    # the fastest of a few runs, to ride out a cold filesystem cache
+    elapsed = min(run["elapsed"] for run in runs)
+    baseline = min(run["elapsed"] for run in baselines)
+    assert elapsed - baseline < STARTUP_BUDGET, (
+        f"{args} took {elapsed * 1000:.0f} ms, "
+        f"{(elapsed - baseline) * 1000:.0f} ms over click's {baseline * 1000:.0f} ms"
+    )
+
+
+def test_cli_lazy_subcommand_help():
+    from click.testing import CliRunner
+
+    from prompthound.cli import LAZY_SUBCOMMANDS, cli
+
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name, (_, short_help) in LAZY_SUBCOMMANDS.items():
+        assert f"  {name}  " in result.output
+        assert short_help[:30] in result.output
+
+        command = cli.get_command(None, name)
+        assert command.name == name
+        assert command.help == short_help
@@ -0,0 +1,267 @@
+import httpx
+import pytest
+import sqlite_utils
+
+from prompthound.vendor.feed_to_sqlite.ingest import get_fetch_state, ingest_feed
+
+URL = "http://example.test/feed.xml"
+
+
+class Origin:
+    """
+    A feed server that honours (or ignores) conditional requests
+    """
+
+    def __init__(self, body, etag=None, last_modified=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.error = None
+        self.requests = []
+
+    def handler(self, request):
+        self.requests.append(request)
+        if self.error:
+            return httpx.Response(self.error, headers={"ETag": '"error-page"'})
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+            if request.headers.get("if-none-match") == self.etag:
+                return httpx.Response(304, headers=headers)
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+            if request.headers.get("if-modified-since") == self.last_modified:
+                return httpx.Response(304, headers=headers)
+        return httpx.Response(200, text=self.body, headers=headers)
+
+    def client(self):
+        return httpx.Client(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.fixture
+def db(tmp_path):
+    return sqlite_utils.Database(tmp_path / "feeds.db")
+
+
+def test_ingest_feed_saves_fetch_state(db, make_rss):
+    origin = Origin(make_rss(), etag='"v1"', last_modified="Mon, 01 Jan 2024")
+
+    result = ingest_feed(db, url=URL, client=origin.client(), table_name="posts")
+
+    assert result.status == "ok" and not result.skipped
+    state = get_fetch_state(db, URL)
+    assert state["etag"] == '"v1"'
+    assert state["last_modified"] == "Mon, 01 Jan 2024"
+    assert state["status"] == 200
+    assert state["content_hash"]
+
+
+def test_ingest_feed_sends_validators_and_skips_304(db, make_rss):
+    origin = Origin(make_rss(), etag='"v1"', last_modified="Mon, 01 Jan 2024")
+    client = origin.client()
+
+    ingest_feed(db, url=URL, client=client, table_name="posts")
+    result = ingest_feed(db, url=URL, client=client, table_name="posts")
+
+    assert origin.requests[-1].headers["if-none-match"] == '"v1"'
+    assert origin.requests[-1].headers["if-modified-since"] == "Mon, 01 Jan 2024"
+    assert result.status == "not_modified" and result.skipped
+    # validators survive a 304 that doesn't repeat them
+    assert get_fetch_state(db, URL)["etag"] == '"v1"'
+    assert get_fetch_state(db, URL)["status"] == 304
+
+
+def test_ingest_feed_skips_identical_body(db, make_rss, monkeypatch):
+    origin = Origin(make_rss())
+    client = origin.client()
+
+    ingest_feed(db, url=URL, client=client, table_name="posts")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged feed was parsed")
+
+    with monkeypatch.context() as m:
+        m.setattr("feedparser.parse", fail)
+        result = ingest_feed(db, url=URL, client=client, table_name="posts")
+
+    assert result.status == "unchanged" and result.skipped
+
+    origin.body = make_rss(entries=4)
+    result = ingest_feed(db, url=URL, client=client, table_name="posts")
+    assert result.status == "ok"
+    assert db["posts"].count == 4
+
+
+def test_ingest_feed_unconditional(db, make_rss):
+    origin = Origin(make_rss(), etag='"v1"')
+    client = origin.client()
+
+    ingest_feed(db, url=URL, client=client, table_name="posts")
+    result = ingest_feed(
+        db, url=URL, client=client, table_name="posts", conditional=False
+    )
+
+    assert "if-none-match" not in origin.requests[-1].headers
+    assert result.status == "ok"
+
+
+def test_ingest_feed_records_failing_status(db, make_rss):
+    origin = Origin(make_rss(), etag='"v1"')
+    client = origin.client()
+    ingest_feed(db, url=URL, client=client, table_name="posts")
+    content_hash = get_fetch_state(db, URL)["content_hash"]
+
+    origin.error = 404
+    with pytest.raises(httpx.HTTPStatusError):
+        ingest_feed(db, url=URL, client=client, table_name="posts")
+
+    state = get_fetch_state(db, URL)
+    assert state["status"] == 404
+    # the validators and hash of the last good fetch are kept
+    assert state["etag"] == '"v1"'
+    assert state["content_hash"] == content_hash
+
+
+def test_ingest_feed_counts_incremental_changes(db, make_rss):
+    result = ingest_feed(db, feed_content=make_rss(entries=5), table_name="posts")
+    assert (result.inserted, result.updated, result.unchanged) == (5, 0, 0)
+
+    feed = make_rss(entries=6).replace("Post 0-2", "Post 0-2 (corrected)")
+    result = ingest_feed(db, feed_content=feed, table_name="posts")
+    assert (result.inserted, result.updated, result.unchanged) == (1, 1, 4)
+
+    assert db["posts"].count == 6
+    assert db["posts"].get("http://example.com/0/2")["title"] == "Post 0-2 (corrected)"
+
+
+def test_ingest_feed_does_not_rewrite_unchanged_entries(db, make_rss):
+    feed = make_rss(entries=600)
+    ingest_feed(db, feed_content=feed, table_name="posts")
+
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    result = ingest_feed(db, feed_content=feed, table_name="posts")
+    db.conn.set_trace_callback(None)
+
+    assert result.unchanged == 600
+    writes = [
+        sql
+        for sql in statements
+        if sql.lstrip().upper().startswith(("INSERT", "UPDATE")) and "[posts]" in sql
+    ]
+    assert writes == []
+    # lookups are batched rather than issued per entry
+    lookups = [sql for sql in statements if "in (" in sql and "[posts]" in sql]
+    assert len(lookups) == 2
+
+
+def test_ingest_feed_looks_up_entries_inside_the_write_transaction(db, make_rss):
+    ingest_feed(db, feed_content=make_rss(entries=5), table_name="posts")
+
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    ingest_feed(db, feed_content=make_rss(entries=6), table_name="posts")
+    db.conn.set_trace_callback(None)
+
+    begin = statements.index("begin immediate")
+    lookup = next(i for i, sql in enumerate(statements) if "in (" in sql)
+    insert = next(i for i, sql in enumerate(statements) if "insert into [posts]" in sql)
+    commit = statements.index("COMMIT", insert)
+    # another ingest can't insert an id between the lookup and the insert
+    assert begin < lookup < insert < commit
+    assert not any(sql.upper() == "COMMIT" for sql in statements[begin:insert])
+
+
+def test_ingest_feed_adds_hash_column_to_existing_tables(db, make_rss):
+    db["posts"].create(
+        {"id": str, "feed": str, "title": str, "published": str, "updated": str},
+        pk="id",
+    )
+    db["posts"].insert({"id": "http://example.com/0/0", "title": "Old"})
+
+    result = ingest_feed(db, feed_content=make_rss(entries=2), table_name="posts")
+
+    assert "content_hash" in db["posts"].columns_dict
+    assert (result.inserted, result.updated) == (1, 1)
+    assert db["posts"].get("http://example.com/0/0")["title"] == "Post 0-0"
+
+
+def test_ingest_feed_reads_schema_once_per_table(db, make_rss):
+    ingest_feed(db, feed_content=make_rss(entries=50), table_name="posts")
+
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    ingest_feed(db, feed_content=make_rss(1, entries=50), table_name="posts")
+    db.conn.set_trace_callback(None)
+
+    pragmas = [sql for sql in statements if sql.upper().startswith("PRAGMA")]
+    assert pragmas == []
+    assert not any("sqlite_master" in sql for sql in statements)
+
+
+def test_schema_cache_sees_columns_added_by_alter(db, make_rss):
+    from prompthound.vendor.feed_to_sqlite.schema import schema_cache
+
+    def normalize(table, entry, feed, client):
+        return {"id": entry.id, "title": entry.title, "extra": "x"}
+
+    ingest_feed(db, feed_content=make_rss(), table_name="posts")
+    assert "extra" not in schema_cache(db).columns("posts")
+
+    ingest_feed(
+        db,
+        feed_content=make_rss(1),
+        table_name="posts",
+        normalize=normalize,
+        alter=True,
+    )
+    assert "extra" in schema_cache(db).columns("posts")
+
+
+def test_ingest_feed_records_stage_timings(db, make_rss):
+    body = make_rss()
+    origin = Origin(body, etag='"v1"')
+    client = origin.client()
+
+    result = ingest_feed(db, url=URL, client=client, table_name="posts")
+
+    assert result.bytes == len(body.encode())
+    assert set(result.timings) == {"download", "parse", "extract", "write", "total"}
+    stages = sum(v for k, v in result.timings.items() if k != "total")
+    assert 0 < stages <= result.timings["total"]
+
+    result = ingest_feed(db, url=URL, client=client, table_name="posts")
+    assert result.status == "not_modified"
+    assert set(result.timings) == {"download", "total"}
+
+
+def test_timings_split_connect_from_download():
+    import time
+
+    from prompthound.vendor.feed_to_sqlite.timings import Timings
+
+    timings = Timings()
+    with timings.request() as extensions:
+        trace = extensions["trace"]
+        trace("connection.connect_tcp.started", {})
+        time.sleep(0.02)
+        trace("connection.connect_tcp.complete", {})
+        trace("http11.send_request_headers.started", {})
+        trace("http11.send_request_headers.complete", {})
+
+    assert timings["connect"] >= 0.02
+    assert timings["download"] < timings["connect"]
+
+
+def test_ingest_feed_indexes_new_entry_tables(db, make_rss):
+    ingest_feed(db, feed_content=make_rss(), table_name="posts")
+
+    indexes = {tuple(index.columns) for index in db["posts"].indexes}
+    assert indexes >= {("feed", "published"), ("updated",)}
+
+    plan = db.execute(
+        "explain query plan select * from posts where feed = ? "
+        "order by published desc limit 10",
+        ["http://example.com/"],
+    ).fetchall()
+    assert "idx_posts_feed_published" in str(plan)
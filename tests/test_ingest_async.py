@@ -0,0 +1,260 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import httpx
+import sqlite_utils
+
+from prompthound.vendor.feed_to_sqlite.aio import ingest_feeds_async
+from prompthound.vendor.feed_to_sqlite.ingest import get_fetch_state
+
+DATA = Path(__file__).parent / "data"
+
+
+class StubServer:
+    """
+    Async mock transport that tracks how many requests are in flight
+    """
+
+    def __init__(self, make_rss, delay=0.01, fail=()):
+        self.make_rss = make_rss
+        self.delay = delay
+        self.fail = set(fail)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_per_host = {}
+        self.per_host = {}
+
+    async def handler(self, request):
+        host = request.url.host
+        self.in_flight += 1
+        self.per_host[host] = self.per_host.get(host, 0) + 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.max_per_host[host] = max(
+            self.max_per_host.get(host, 0), self.per_host[host]
+        )
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+            self.per_host[host] -= 1
+
+        n = int(request.url.path.strip("/"))
+        if n in self.fail:
+            return httpx.Response(500)
+        return httpx.Response(200, text=self.make_rss(n))
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def open_db(tmp_path):
+    "A database the crawl's writer thread may use"
+    conn = sqlite3.connect(tmp_path / "feeds.db", check_same_thread=False)
+    return sqlite_utils.Database(conn)
+
+
+def crawl(db, urls, server, **kwargs):
+    async def run():
+        async with server.client() as client:
+            return await ingest_feeds_async(db, urls, client=client, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_ingest_feeds_async_writes_every_feed(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(make_rss)
+    urls = [f"http://host{n % 5}.test/{n}" for n in range(50)]
+
+    results = crawl(db, urls, server, table_name="posts", concurrency=10, per_host=2)
+
+    assert len(results) == 50
+    assert all(r.status == "ok" and r.entries == 3 for r in results)
+    assert db["posts"].count == 150
+    assert all(
+        r.bytes == len(make_rss(int(r.url.rsplit("/", 1)[1])).encode()) for r in results
+    )
+    for result in results:
+        assert {"download", "parse", "extract", "write", "total"} <= set(result.timings)
+
+
+def test_ingest_feeds_async_respects_limits(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(make_rss, delay=0.02)
+    urls = [f"http://host{n % 4}.test/{n}" for n in range(40)]
+
+    crawl(db, urls, server, concurrency=6, per_host=2)
+
+    assert server.max_in_flight <= 6
+    assert all(count <= 2 for count in server.max_per_host.values())
+    # with four hosts at two each, the global limit is actually reached
+    assert server.max_in_flight == 6
+
+
+def test_ingest_feeds_async_records_errors(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(make_rss, fail={3})
+    urls = [f"http://example.test/{n}" for n in range(5)]
+
+    results = crawl(db, urls, server, table_name="posts", concurrency=5)
+
+    by_url = {r.url: r for r in results}
+    assert by_url["http://example.test/3"].status == "error"
+    assert sum(r.status == "ok" for r in results) == 4
+    assert db["posts"].count == 12
+    assert get_fetch_state(db, "http://example.test/3")["status"] == 500
+
+
+def test_ingest_feeds_async_records_malformed_feeds(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(
+        lambda n: make_rss(n).replace("<link>http://example.com/</link>", "")
+        if n == 1
+        else make_rss(n)
+    )
+    urls = [f"http://example.test/{n}" for n in range(3)]
+
+    results = crawl(db, urls, server, table_name="posts", concurrency=3)
+
+    by_url = {r.url: r for r in results}
+    assert by_url["http://example.test/1"].status == "error"
+    assert sum(r.status == "ok" for r in results) == 2
+    assert db["posts"].count == 6
+
+
+def test_ingest_feeds_async_consumes_urls_lazily(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(make_rss)
+    served = []
+    pulled = 0
+
+    def urls():
+        nonlocal pulled
+        for n in range(20):
+            pulled += 1
+            # one URL is read ahead while waiting for a free slot
+            assert pulled - len(served) <= 4 + 1
+            yield f"http://example.test/{n}"
+
+    async def handler(request):
+        response = await server.handler(request)
+        served.append(request.url)
+        return response
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await ingest_feeds_async(
+                db, urls(), client=client, table_name="posts", concurrency=4
+            )
+
+    results = asyncio.run(run())
+    assert [r.status for r in results] == ["ok"] * 20
+
+
+def test_ingest_feeds_async_skips_unchanged_feeds(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(make_rss)
+    urls = [f"http://example.test/{n}" for n in range(5)]
+
+    first = crawl(db, urls, server, table_name="posts", concurrency=5)
+    second = crawl(db, urls, server, table_name="posts", concurrency=5)
+
+    assert not any(r.skipped for r in first)
+    assert [r.status for r in second] == ["unchanged"] * 5
+
+
+def test_parse_feed_rows_matches_ingest_feed(tmp_path):
+    import pickle
+
+    from prompthound.vendor.feed_to_sqlite.ingest import ingest_feed, parse_feed_rows
+
+    content = (DATA / "Pluralistic_archive_sample.xml").read_text()
+
+    parsed = parse_feed_rows(content, table_name="posts")
+    assert pickle.loads(pickle.dumps(parsed)) == parsed
+    assert all(type(row) is dict for row in parsed["entries"])
+
+    db = open_db(tmp_path)
+    ingest_feed(db, feed_content=content, table_name="posts")
+    stored = {row["id"]: row for row in db["posts"].rows}
+    for row in parsed["entries"]:
+        assert {k: stored[row["id"]][k] for k in row} == row
+
+
+def test_ingest_feeds_parses_local_files_in_process_pool(tmp_path, make_rss):
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"feed{n}.xml"
+        path.write_text(make_rss(n, entries=4))
+        paths.append(path.as_uri() if n % 2 else str(path))
+
+    db = open_db(tmp_path)
+    results = asyncio.run(
+        ingest_feeds_async(
+            db,
+            paths,
+            table_name="posts",
+            concurrency=4,
+            workers=2,
+            local_files=True,
+        )
+    )
+
+    assert sorted(r.status for r in results) == ["ok"] * 6
+    assert db["posts"].count == 24
+    assert db["feeds"].count == 1
+
+
+def test_ingest_feeds_async_ignores_local_files_by_default(tmp_path, make_rss):
+    path = tmp_path / "feed.xml"
+    path.write_text(make_rss())
+    db = open_db(tmp_path)
+
+    results = asyncio.run(
+        ingest_feeds_async(
+            db, [str(path), path.as_uri(), "example.com/feed"], table_name="posts"
+        )
+    )
+
+    assert [r.status for r in results] == ["error"] * 3
+    assert all("protocol" in r.error for r in results)
+    assert not db["posts"].exists()
+
+
+def test_ingest_feeds_async_enforces_max_bytes(tmp_path, make_rss):
+    db = open_db(tmp_path)
+    server = StubServer(make_rss)
+
+    results = crawl(
+        db, ["http://example.test/1"], server, table_name="posts", max_bytes=100
+    )
+
+    assert results[0].status == "error"
+    assert "exceeds 100 bytes" in results[0].error
+
+
+def test_ingest_feeds_async_writes_off_the_event_loop(tmp_path, make_rss, monkeypatch):
+    import threading
+
+    from prompthound.vendor.feed_to_sqlite import aio
+
+    threads = set()
+    write_rows = aio.write_rows
+
+    def recording_write_rows(*args, **kwargs):
+        threads.add(threading.current_thread())
+        return write_rows(*args, **kwargs)
+
+    monkeypatch.setattr(aio, "write_rows", recording_write_rows)
+    db = open_db(tmp_path)
+    server = StubServer(make_rss)
+    urls = [f"http://example.test/{n}" for n in range(5)]
+
+    results = crawl(db, urls, server, table_name="posts", concurrency=5)
+
+    assert [r.status for r in results] == ["ok"] * 5
+    # every write went through the one database thread
+    assert len(threads) == 1
+    assert threading.main_thread() not in threads
@@ -0,0 +1,98 @@
+import json
+import logging
+
+import pytest
+from loguru import logger
+
+from prompthound.logconfig import InterceptHandler, logging_config
+
+
+@pytest.fixture
+def reset_logging():
+    yield
+    logger.remove()
+    logging.basicConfig(handlers=[], force=True)
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def log_from_here(name, message, level=logging.INFO):
+    logging.getLogger(name).log(level, message)
+
+
+def capture(level):
+    "Route loguru output at `level` and above into a list of records"
+    records = []
+    logger.add(lambda message: records.append(message.record), level=level)
+    return records
+
+
+def test_intercepted_caller(reset_logging):
+    logging_config(log_level="INFO")
+    records = capture("INFO")
+
+    for _ in range(3):  # the first call walks the frames, the rest hit the cache
+        log_from_here("test.caller", "hello")
+    logging.getLogger("test.caller").info("direct")
+
+    assert [r["function"] for r in records] == ["log_from_here"] * 3 + [
+        "test_intercepted_caller"
+    ]
+    assert {r["message"] for r in records} == {"hello", "direct"}
+
+
+def test_intercepted_caller_cache_checks_the_frame(reset_logging):
+    logging_config(log_level="INFO")
+    records = capture("INFO")
+
+    def wrapped():
+        log_from_here("test.caller", "hello")
+
+    log_from_here("test.caller", "hello")
+    # make the cached depth stale; it must be noticed rather than trusted
+    handler = next(
+        h for h in logging.getLogger().handlers if isinstance(h, InterceptHandler)
+    )
+    for key, (depth, code) in list(handler._callers.items()):
+        handler._callers[key] = (depth + 1, code)
+    wrapped()
+
+    assert [r["function"] for r in records] == ["log_from_here", "log_from_here"]
+
+
+def test_records_below_threshold_are_dropped_early(reset_logging, monkeypatch):
+    logging_config(log_level="WARNING")
+    emitted = []
+    monkeypatch.setattr(InterceptHandler, "emit", lambda self, r: emitted.append(r))
+
+    log_from_here("test.threshold", "quiet", logging.DEBUG)
+    log_from_here("test.threshold", "loud", logging.ERROR)
+
+    assert [r.getMessage() for r in emitted] == ["loud"]
+    assert not logging.getLogger("test.threshold").isEnabledFor(logging.INFO)
+
+    # reconfiguring moves the threshold on the existing handler
+    logging_config(log_level="DEBUG")
+    assert logging.getLogger("test.threshold").isEnabledFor(logging.DEBUG)
+    assert (
+        len(
+            [h for h in logging.getLogger().handlers if isinstance(h, InterceptHandler)]
+        )
+        == 1
+    )
+
+
+def test_json_log_file(reset_logging, tmp_path):
+    log_file = tmp_path / "log.jsonl"
+    logging_config(
+        log_level="INFO", log_file=str(log_file), enqueue=True, serialize=True
+    )
+
+    log_from_here("test.json", "structured")
+    logger.complete()
+    logger.remove()
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    record = lines[-1]["record"]
+    assert record["message"] == "structured"
+    assert record["function"] == "log_from_here"
+    assert record["level"]["name"] == "INFO"
@@ -0,0 +1,257 @@
+import io
+from pathlib import Path
+
+import httpx
+import pytest
+import sqlite_utils
+
+from prompthound.vendor.feed_to_sqlite.ingest import ingest_feed
+from prompthound.vendor.feed_to_sqlite.stream import (
+    FeedTooLarge,
+    StreamingFeedParser,
+    ingest_feed_stream,
+    ingest_feed_streaming,
+    iter_opml_urls,
+)
+
+DATA = Path(__file__).parent / "data"
+URL = "http://example.test/feed.xml"
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Stub</title>
+  <link rel="self" href="http://example.com/feed.atom"/>
+  <link href="http://example.com/"/>
+  <id>urn:example:feed</id>
+  <updated>2024-01-02T00:00:00Z</updated>
+  <entry>
+    <title>First</title>
+    <link href="http://example.com/1"/>
+    <id>urn:example:1</id>
+    <published>2024-01-01T00:00:00Z</published>
+    <updated>2024-01-02T00:00:00Z</updated>
+    <content type="html">&lt;p&gt;Body&lt;/p&gt;</content>
+  </entry>
+</feed>
+"""
+
+
+def chunked(content, size=4096):
+    return (content[i : i + size] for i in range(0, len(content), size))
+
+
+def stored(db, table):
+    return {
+        row["id"]: {k: v for k, v in row.items() if k != "content_hash"}
+        for row in db[table].rows
+    }
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        (DATA / "Pluralistic_archive_sample.xml").read_bytes(),
+        ATOM.encode(),
+    ],
+    ids=["rss", "atom"],
+)
+def test_streaming_matches_ingest_feed(tmp_path, content):
+    expected = sqlite_utils.Database(memory=True)
+    ingest_feed(expected, feed_content=content, table_name="posts")
+
+    db = sqlite_utils.Database(tmp_path / "feeds.db")
+    result = ingest_feed_stream(db, chunked(content), table_name="posts", batch_size=7)
+
+    assert result.entries == expected["posts"].count
+    assert stored(db, "posts") == stored(expected, "posts")
+    assert list(db["feeds"].rows) == list(expected["feeds"].rows)
+
+
+def test_streaming_parser_yields_entries_as_they_close(make_rss):
+    parser = StreamingFeedParser()
+    content = make_rss(entries=50).encode()
+
+    sizes = [len(parser.feed(chunk)) for chunk in chunked(content, 512)]
+    sizes.append(len(parser.close()))
+
+    assert sum(sizes) == 50
+    assert max(sizes) < 50
+    assert parser.feed_info["title"] == "Stub Feed"
+
+
+def test_ingest_feed_stream_writes_in_batches(tmp_path, make_rss):
+    db = sqlite_utils.Database(tmp_path / "feeds.db")
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+
+    result = ingest_feed_stream(
+        db,
+        chunked(make_rss(entries=100).encode(), 256),
+        table_name="posts",
+        batch_size=10,
+    )
+
+    assert (result.status, result.inserted) == ("ok", 100)
+    lookups = [sql for sql in statements if sql.startswith("select [id]")]
+    assert len(lookups) >= 10
+
+
+@pytest.mark.parametrize(
+    "missing, table_name, error",
+    [
+        ("<title>Stub Feed</title>", None, "no title"),
+        ("<link>http://example.com/</link>", "posts", "no link"),
+    ],
+)
+def test_ingest_feed_stream_reports_incomplete_feeds(
+    tmp_path, make_rss, missing, table_name, error
+):
+    db = sqlite_utils.Database(tmp_path / "feeds.db")
+    body = make_rss(entries=1000).replace(missing, "").encode()
+    read = 0
+
+    def chunks():
+        nonlocal read
+        for chunk in chunked(body, 256):
+            read += len(chunk)
+            yield chunk
+
+    result = ingest_feed_stream(db, chunks(), table_name=table_name, batch_size=10)
+
+    assert result.status == "error"
+    assert error in result.error
+    # it gives up after one batch rather than holding every entry
+    assert read < len(body) / 10
+    assert db.table_names() == []
+
+    # small feeds fail the same way when the parser closes
+    small = make_rss(entries=3).replace(missing, "").encode()
+    result = ingest_feed_stream(db, [small], table_name=table_name, batch_size=10)
+    assert result.status == "error"
+    assert error in result.error
+
+
+def test_ingest_feed_streaming_enforces_max_bytes(tmp_path, make_rss):
+    body = make_rss(entries=200)
+
+    def handler(request):
+        return httpx.Response(200, content=iter([body.encode()]))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    db = sqlite_utils.Database(tmp_path / "feeds.db")
+
+    with pytest.raises(FeedTooLarge):
+        ingest_feed_streaming(db, url=URL, client=client, max_bytes=1000)
+
+    result = ingest_feed_streaming(db, url=URL, client=client, table_name="posts")
+    assert result.inserted == 200
+
+
+def test_ingest_feed_streaming_skips_304(tmp_path, make_rss):
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=make_rss(), headers={"ETag": '"v1"'})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    db = sqlite_utils.Database(tmp_path / "feeds.db")
+
+    first = ingest_feed_streaming(db, url=URL, client=client, table_name="posts")
+    second = ingest_feed_streaming(db, url=URL, client=client, table_name="posts")
+
+    assert first.status == "ok"
+    assert second.status == "not_modified"
+
+
+def test_ingest_feed_streaming_reports_malformed_bodies(tmp_path, make_rss):
+    pages = {
+        "/html": "<html><body><p>Service unavailable<br></body></html>",
+        "/feed": make_rss(),
+    }
+
+    def handler(request):
+        return httpx.Response(200, text=pages[request.url.path])
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    db = sqlite_utils.Database(tmp_path / "feeds.db")
+
+    result = ingest_feed_streaming(
+        db, url="http://example.test/html", client=client, table_name="posts"
+    )
+    assert result.status == "error"
+    assert "mismatched tag" in result.error
+
+    result = ingest_feed_streaming(
+        db, url="http://example.test/feed", client=client, table_name="posts"
+    )
+    assert result.status == "ok"
+
+
+def test_iter_opml_urls():
+    opml = b"""<?xml version="1.0"?>
+    <opml version="2.0"><head><title>Subs</title></head><body>
+      <outline text="News">
+        <outline text="A" type="rss" xmlUrl="http://a.example/feed"/>
+        <outline text="B" type="rss" xmlUrl="http://b.example/feed"/>
+      </outline>
+      <outline text="C" type="rss" xmlUrl="http://c.example/feed"/>
+      <outline text="No feed"/>
+    </body></opml>"""
+
+    urls = iter_opml_urls(io.BytesIO(opml))
+
+    assert next(urls) == "http://a.example/feed"
+    assert list(urls) == ["http://b.example/feed", "http://c.example/feed"]
+
+
+def test_cli_stream_records_per_feed_errors(tmp_path, make_rss, monkeypatch):
+    from click.testing import CliRunner
+
+    from prompthound.vendor.feed_to_sqlite.cli import cli
+
+    pages = {"/big": make_rss(entries=200), "/small": make_rss(1)}
+
+    def handler(request):
+        return httpx.Response(200, text=pages[request.url.path])
+
+    client_class = httpx.Client
+    monkeypatch.setattr(
+        httpx,
+        "Client",
+        lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    db_path = tmp_path / "feeds.db"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--stream",
+            "--max-bytes",
+            "2000",
+            "--table",
+            "posts",
+            str(db_path),
+            "http://x.test/big",
+            "http://x.test/small",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "http://x.test/big: response body exceeds 2000 bytes" in result.output
+    assert sqlite_utils.Database(db_path)["posts"].count == 3
+
+
+@pytest.mark.parametrize(
+    "option", [["--concurrency", "4"], ["--workers", "2"], ["--local-files"]]
+)
+def test_cli_stream_rejects_async_options(tmp_path, option):
+    from click.testing import CliRunner
+
+    from prompthound.vendor.feed_to_sqlite.cli import cli
+
+    result = CliRunner().invoke(
+        cli, ["--stream", *option, str(tmp_path / "feeds.db"), URL]
+    )
+
+    assert result.exit_code == 2
+    assert "can't be combined" in result.output
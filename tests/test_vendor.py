@@ -1,3 +1,4 @@
+import sys
 import warnings
 import pytest
 
@@ -9,3 +10,99 @@ def test_import_slugify_no_warning():
         warnings.simplefilter("always")
         from prompthound.vendor import slugify
         assert len(w) == 0, f"Importing slugify produced unexpected warnings: {w}"
+
+
+def _vendored_slugify_outputs(factory):
+    """
+    Run the vendored slugify test suite with every `Slugify` built by `factory`,
+    returning the values passed to each `assertEqual`
+    """
+    import types
+    import unittest
+    from pathlib import Path
+
+    from prompthound.vendor import slugify as vendored
+
+    module = types.ModuleType("slugify")
+    module.__dict__.update(vendored.__dict__)
+    module.Slugify = factory
+    module.slugify = factory()
+    module.slugify_unicode = factory(translate=None)
+    module.unique_slugify = vendored.UniqueSlugify()
+    module.slugify_url = factory(to_lower=True, stop_words=("a", "an", "the"))
+    module.slugify_url.max_length = 200
+    module.slugify_filename = factory(separator="_", safe_chars="-.", max_length=255)
+    module.slugify_ru = factory(pretranslate=vendored.CYRILLIC)
+    module.slugify_de = factory(pretranslate=vendored.GERMAN)
+    module.slugify_el = factory(pretranslate=vendored.GREEK)
+
+    outputs = []
+    assert_equal = unittest.TestCase.assertEqual
+
+    def recording_assert_equal(self, first, second, msg=None):
+        outputs.append((self.id(), first))
+        assert_equal(self, first, second, msg)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(sys.modules, "slugify", module)
+        monkeypatch.setattr(unittest.TestCase, "assertEqual", recording_assert_equal)
+
+        path = Path(vendored.__file__).with_name("tests.py")
+        tests = types.ModuleType("slugify_tests")
+        exec(compile(path.read_text(), str(path), "exec"), tests.__dict__)
+        suite = unittest.defaultTestLoader.loadTestsFromModule(tests)
+        suite.run(unittest.TestResult())
+
+    return outputs
+
+
+def test_fast_slugify_matches_slugify_on_vendored_tests():
+    from prompthound.vendor.slugify import FastSlugify, Slugify
+
+    expected = _vendored_slugify_outputs(Slugify)
+    assert expected
+    assert _vendored_slugify_outputs(FastSlugify) == expected
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"to_lower": True, "separator": "_", "max_length": 100},
+        {"to_lower": True, "safe_chars": "-.' ", "capitalize": True},
+        {"to_lower": True, "max_length": 12},
+        {"to_lower": True, "translate": None},
+        {"to_lower": True, "stop_words": ("the", "a")},
+        {},
+    ],
+)
+def test_fast_slugify_matches_slugify(options):
+    from prompthound.vendor.slugify import FastSlugify, Slugify
+
+    texts = [
+        "Pluralistic: Daily links from Cory Doctorow",
+        "Pluralistic: Daily links from Cory Doctorow",  # cached
+        "  The Quick brown FOX's {p} \\ jumps -- over_the (lazy) dog!  ",
+        "Ünïcode café — naïve résumé",
+        b"bytes title",
+        "",
+        "\t\n\x00\x7f",
+    ]
+    slow = Slugify(**options)
+    fast = FastSlugify(**options)
+    for text in texts:
+        assert fast(text) == slow(text)
+        assert fast(text, max_length=5) == slow(text, max_length=5)
+
+    # changing an option clears the cache
+    fast.separator = slow.separator = "+"
+    assert fast(texts[0]) == slow(texts[0])
+
+
+def test_fast_slugify_cache():
+    from prompthound.vendor.slugify import FastSlugify
+
+    slugify = FastSlugify(to_lower=True, cache_size=2)
+    for text in ["one", "two", "one", "three", "four"]:
+        slugify(text)
+    info = slugify.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 2)